@@ -0,0 +1,82 @@
+from importlib import import_module
+from time import perf_counter
+from profiler import phase
+
+# ---------------------------------------------------------------------------- #
+#                               Backend Interface                              #
+# ---------------------------------------------------------------------------- #
+
+class Backend:
+  """Base class for a benchmarked database
+
+  Subclasses import their driver at module level, so a backend's driver is
+  only loaded once the backend is requested through `get_backend`.
+  """
+
+  KEY = None
+  NAME = None
+
+  def connect(self):
+    """Open the connection to the database
+    """
+    raise NotImplementedError
+
+  def load(self, data):
+    """Insert dummy data into the database
+    """
+    raise NotImplementedError
+
+  def test_1(self):
+    """Test query 1 (flip-flop name update)
+    """
+    raise NotImplementedError
+
+  def test_2(self):
+    """Test query 2 (profile lookup)
+    """
+    raise NotImplementedError
+
+  def test_3(self):
+    """Test query 3 (friends of friends)
+    """
+    raise NotImplementedError
+
+  def teardown(self):
+    """Close the connection to the database
+    """
+    raise NotImplementedError
+
+  def run_test(self, query):
+    """Run a single test query as a profiled phase
+    """
+    with phase(f"t_{self.KEY}_{query}"):
+      getattr(self, f"test_{query}")()
+
+  def test_all(self):
+    """Test all query
+    """
+    t = perf_counter()
+
+    for _ in range(10):
+      self.run_test(1)
+    for _ in range(10):
+      self.run_test(2)
+    for _ in range(10):
+      self.run_test(3)
+
+    print(f"{self.NAME} query 1, 2, and 3 complete! ({perf_counter()-t}s)")
+
+# ---------------------------------------------------------------------------- #
+#                               Backend Registry                               #
+# ---------------------------------------------------------------------------- #
+
+BACKENDS = {
+  "p": ("backends.postgresql", "PostgreSQL"),
+  "n": ("backends.neo4j", "Neo4j"),
+}
+
+def get_backend(key) -> Backend:
+  """Import and instantiate the backend registered under `key`
+  """
+  module, name = BACKENDS[key]
+  return getattr(import_module(module), name)()
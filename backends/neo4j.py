@@ -0,0 +1,143 @@
+from os import getenv as env
+from time import perf_counter
+from py2neo import Graph
+from backends import Backend
+from profiler import phase
+
+# ---------------------------------------------------------------------------- #
+#                                     Neo4J                                    #
+# ---------------------------------------------------------------------------- #
+
+class Neo4j(Backend):
+  KEY = "n"
+  NAME = "Neo4J"
+
+  def connect(self):
+    """Connect to Neo4j
+    """
+    self.graph = Graph(f"bolt://{env('NEO4J_HOST')}", auth=(env('NEO4J_USER'), env('NEO4J_PASS')))
+
+  def teardown(self):
+    """Close the Neo4j connection
+    """
+    self.graph.service.connector.close()
+
+  def load(self, data):
+    """Insert dummy data for Neo4j
+    """
+    t = perf_counter()
+
+    if input("Are you sure you want to rebuild the Neo4j database? (y/n): ") != 'y': return
+
+    print('Starting data insertion for PostgreSQL!')
+    with phase("g_n.delete"):
+      print('  Deleting previous data...')
+      self.graph.delete_all()
+    with phase("g_n.user"):
+      print(f'  Populating user nodes ({len(data["users"])-1})...')
+      for id, user in enumerate(data["users"]):
+        if user is not None:
+          self.graph.update("CREATE (u:User {user_id: $user_id, name: $name, email: $email, phone_number: $phone_number, birth_date: $birth_date})", {"user_id": id, **user})
+    with phase("g_n.user_index"):
+      print(f'  Creating user_id index ({len(data["users"])-1})...')
+      self.graph.update("CREATE INDEX user_id FOR (u:User) ON (u.user_id)")
+    with phase("g_n.company"):
+      print(f'  Populating company nodes ({len(data["companies"])-1})...')
+      for id, company in enumerate(data["companies"]):
+        if company is not None:
+          self.graph.update("CREATE (c:Company {company_id: $company_id, name: $name})", {"company_id": id, **company})
+    with phase("g_n.company_index"):
+      print(f'  Creating company_id index ({len(data["companies"])-1})...')
+      self.graph.update("CREATE INDEX company_id FOR (c:Company) ON (c.company_id)")
+    with phase("g_n.institution"):
+      print(f'  Populating institution nodes ({len(data["institutions"])-1})...')
+      for id, institution in enumerate(data["institutions"]):
+        if institution is not None:
+          self.graph.update("CREATE (i:Institution {institution_id: $institution_id, name: $name})", {"institution_id": id, **institution})
+    with phase("g_n.institution_index"):
+      print(f'  Creating institution_id index ({len(data["institutions"])-1})...')
+      self.graph.update("CREATE INDEX institution_id FOR (i:Institution) ON (i.institution_id)")
+    with phase("g_n.connection"):
+      print(f'  Populating connection relationships ({len(data["connections"])})...')
+      for x in data["connections"]:
+        self.graph.update("MATCH (a:User), (b:User) WHERE a.user_id = $user_id_a AND b.user_id = $user_id_b CREATE (a)-[:CONNECTION {date_start: $start_date}]->(b)", x)
+    with phase("g_n.employment"):
+      print(f'  Populating employment relationships ({len(data["employments"])})...')
+      for x in data["employments"]:
+        self.graph.update("MATCH (u:User), (c:Company) WHERE u.user_id = $user_id AND c.company_id = $company_id CREATE (u)-[:EMPLOYMENT {date_start: $start_date, date_end: $end_date, role: $role}]->(c)", x)
+    with phase("g_n.education"):
+      print(f'  Populating education relationships ({len(data["educations"])})...')
+      for x in data["educations"]:
+        self.graph.update("MATCH (u:User), (i:Institution) WHERE u.user_id = $user_id AND i.institution_id = $institution_id CREATE (u)-[:EDUCATION {date_start: $start_date, date_end: $end_date, degree: $degree}]->(i)", x)
+
+    print(f"Data insertion complete! ({perf_counter()-t}s)")
+
+  def test_1(self):
+    """Test query 1 for Neo4j
+    """
+    t = perf_counter()
+
+    COUNT = 1000
+    print(f"Starting test 1 for Neo4j! ({COUNT})")
+  
+    initial_name = self.graph.evaluate("MATCH (u:User {user_id: 1}) RETURN u.name")
+    print(f"  Initial name: {initial_name}")
+    print(f"  Running {COUNT} flip-flop queries...")
+    for _ in range(COUNT):
+      name = self.graph.evaluate("MATCH (u:User {user_id: 1}) RETURN u.name")
+      if name == 'TEST':
+        self.graph.update('''
+          MATCH (u:User {user_id: 1}) SET u.name = $name
+        ''', {"name": initial_name})
+      else:
+        self.graph.update('''
+          MATCH (u:User {user_id: 1}) SET u.name = $name
+        ''', {"name": "TEST"})
+  
+    final_name = self.graph.evaluate("MATCH (u:User {user_id: 1}) RETURN u.name")
+    print(f"  Final name: {final_name}")
+
+    print(f"Neo4J query 1 complete! ({perf_counter()-t}s)")
+
+  def test_2(self):
+    """Test query 2 for Neo4j
+    """
+    t = perf_counter()
+
+    COUNT = 1000
+    print(f"Starting test 2 for Neo4j! ({COUNT})")
+
+    print(f"  Running {COUNT} profile queries...")
+    for _ in range(COUNT):
+      self.graph.run('''
+        MATCH (u:User {user_id: 1})-[co:CONNECTION]-(u2:User)
+        RETURN u.name, co.date_start, u2.name
+      ''')
+      self.graph.run('''
+        MATCH (u:User {user_id: 1})-[em:EMPLOYMENT]-(c:Company)
+        RETURN u.name, em.date_start, em.date_end, em.role, c.name
+      ''')
+      self.graph.run('''
+        MATCH (u:User {user_id: 1})-[ed:EDUCATION]-(i:Institution)
+        RETURN u.name, ed.date_start, ed.date_end, ed.degree, i.name
+      ''')
+
+    print(f"Neo4J query 2 complete! ({perf_counter()-t}s)")
+
+  def test_3(self):
+    """Test query 3 for Neo4j
+    """
+    t = perf_counter()
+
+    COUNT = 1000
+    print(f"Starting test 3 for Neo4j! ({COUNT}))")
+
+    print(f"  Running {COUNT} complex quer{'y' if COUNT == 1 else 'ies'}...")
+    for id in range(1,COUNT+1):
+      self.graph.run('''
+        MATCH (u:User {user_id: $user_id})-[:CONNECTION*2]-(u2:User)
+        WHERE NOT ((u)-[:CONNECTION]-(u2))
+        RETURN u2.user_id
+      ''', {"user_id": id})
+
+    print(f"Neo4J query 3 complete! ({perf_counter()-t}s)")
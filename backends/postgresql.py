@@ -0,0 +1,265 @@
+import psycopg2
+from os import getenv as env
+from time import perf_counter
+from backends import Backend
+from profiler import phase
+
+# ---------------------------------------------------------------------------- #
+#                                  PostgreSQL                                  #
+# ---------------------------------------------------------------------------- #
+
+class PostgreSQL(Backend):
+  KEY = "p"
+  NAME = "PostgreSQL"
+
+  def connect(self):
+    """Connect to PostgreSQL
+    """
+    self.conn = psycopg2.connect(f"user='{env('POSTGRE_USER')}' password='{env('POSTGRE_PASS')}' host='{env('POSTGRE_HOST')}' port='5432'")
+
+  def teardown(self):
+    """Close the PostgreSQL connection
+    """
+    self.conn.close()
+
+  def load(self, data):
+    """Insert dummy data for PostgreSQL
+    """
+    t = perf_counter()
+
+    if input("Are you sure you want to rebuild the PostgreSQL database? (y/n): ") != 'y': return
+
+    c = self.conn.cursor()
+
+    print('Starting data insertion for PostgreSQL!')
+    with phase("g_p.delete"):
+      print('  Deleting previous data...')
+      c.execute('''
+        DO
+        $do$
+        DECLARE
+          _tbl text;
+        BEGIN
+        FOR _tbl  IN
+            SELECT quote_ident(table_schema) || '.'
+                || quote_ident(table_name)
+            FROM   information_schema.tables
+            WHERE  table_name LIKE 'test_' || '%'
+            AND    table_schema NOT LIKE 'pg\_%'
+        LOOP
+          EXECUTE
+          'DROP TABLE ' || _tbl || ' CASCADE';
+        END LOOP;
+        END
+        $do$;
+      ''')
+    with phase("g_p.user"):
+      print(f'  Populating user table ({len(data["users"])-1})...')
+      c.execute('''
+        CREATE TABLE test_user (
+          user_id SERIAL PRIMARY KEY,
+          name TEXT,
+          email TEXT,
+          phone_number TEXT,
+          birth_date DATE
+        )
+      ''')
+      c.executemany('''
+        INSERT INTO test_user VALUES (%s, %s, %s, %s, %s)
+      ''', [(i, user['name'], user['email'], user['phone_number'], user['birth_date']) for i, user in enumerate(data['users']) if user is not None])
+    with phase("g_p.company"):
+      print(f'  Populating company table ({len(data["companies"])-1})...')
+      c.execute('''
+        CREATE TABLE test_company (
+          company_id SERIAL PRIMARY KEY,
+          name TEXT
+        )
+      ''')
+      c.executemany('''
+        INSERT INTO test_company VALUES (%s, %s)
+      ''', [(i, company['name']) for i, company in enumerate(data['companies']) if company is not None])
+    with phase("g_p.institution"):
+      print(f'  Populating institution table ({len(data["institutions"])-1})...')
+      c.execute('''
+        CREATE TABLE test_institution (
+          institution_id SERIAL PRIMARY KEY,
+          name TEXT
+        )
+      ''')
+      c.executemany('''
+        INSERT INTO test_institution VALUES (%s, %s)
+      ''', [(i, institution['name']) for i, institution in enumerate(data['institutions']) if institution is not None])
+    with phase("g_p.connection"):
+      print(f'  Populating connection table ({len(data["connections"])})...')
+      c.execute('''
+        CREATE TABLE test_connection (
+          user_id_a INT REFERENCES test_user(user_id),
+          user_id_b INT REFERENCES test_user(user_id),
+          date_start DATE,
+          PRIMARY KEY (user_id_a, user_id_b)
+        )
+      ''')
+      c.executemany('''
+        INSERT INTO test_connection VALUES (%s, %s, %s)
+      ''', [(x['user_id_a'], x['user_id_b'], x['start_date']) for x in data['connections']])
+    with phase("g_p.employment"):
+      print(f'  Populating employment table ({len(data["employments"])})...')
+      c.execute('''
+        CREATE TABLE test_employment (
+          user_id INT REFERENCES test_user(user_id),
+          company_id INT REFERENCES test_company(company_id),
+          date_start DATE,
+          date_end DATE,
+          role TEXT,
+          PRIMARY KEY (user_id, company_id, date_start, date_end, role)
+        )
+      ''')
+      c.executemany('''
+        INSERT INTO test_employment VALUES (%s, %s, %s, %s, %s)
+      ''', [(x['user_id'], x['company_id'], x['start_date'], x['end_date'], x['role']) for x in data['employments']])
+    with phase("g_p.education"):
+      print(f'  Populating education table ({len(data["educations"])})...')
+      c.execute('''
+        CREATE TABLE test_education (
+          user_id INT REFERENCES test_user(user_id),
+          institution_id INT REFERENCES test_institution(institution_id),
+          date_start DATE,
+          date_end DATE,
+          degree TEXT,
+          PRIMARY KEY (user_id, institution_id, date_start, date_end, degree)
+        )
+      ''')
+      c.executemany('''
+        INSERT INTO test_education VALUES (%s, %s, %s, %s, %s)
+      ''', [(x['user_id'], x['institution_id'], x['start_date'], x['end_date'], x['degree']) for x in data['educations']])
+    with phase("g_p.commit"):
+      self.conn.commit()
+
+    print(f"Data insertion complete! ({perf_counter()-t}s)")
+
+  def test_1(self):
+    """Test query 1 for PostgreSQL
+    """
+    t = perf_counter()
+    c = self.conn.cursor()
+
+    COUNT = 1000
+    print(f"Starting test 1 for PostgreSQL! ({COUNT})")
+  
+    c.execute('''
+      SELECT name FROM test_user WHERE user_id = 1
+    ''')
+    (initial_name,) = c.fetchone()
+    print(f"  Initial name: {initial_name}")
+    print(f"  Running {COUNT} flip-flop queries...")
+    for _ in range(COUNT):
+      c.execute('''
+        SELECT name FROM test_user WHERE user_id = 1
+      ''')
+      (name,) = c.fetchone()
+      if name == 'TEST':
+        c.execute('''
+          UPDATE test_user SET name = %s WHERE user_id = 1
+        ''', (initial_name,))
+      else:
+        c.execute('''
+          UPDATE test_user SET name = 'TEST' WHERE user_id = 1
+        ''')
+      self.conn.commit()
+  
+    c.execute('''
+      SELECT name FROM test_user WHERE user_id = 1
+    ''')
+    (name,) = c.fetchone()
+    print(f"  Final name: {name}")
+
+    print(f"PostgreSQL query 1 complete! ({perf_counter()-t}s)")
+
+
+  def test_2(self):
+    """Test query 2 for PostgreSQL
+    """
+    t = perf_counter()
+    c = self.conn.cursor()
+
+    COUNT = 1000
+    print(f"Starting test 2 for PostgreSQL! ({COUNT})")
+
+    print(f"  Running {COUNT} profile queries...")
+    for _ in range(COUNT):
+      c.execute('''
+        SELECT * FROM test_user WHERE user_id = 1
+      ''')
+      c.execute('''
+        SELECT * FROM test_connection, test_user 
+        WHERE (
+          test_connection.user_id_a = 1
+          AND test_connection.user_id_b = test_user.user_id
+        ) OR (
+          test_connection.user_id_b = 1
+          AND test_connection.user_id_a = test_user.user_id
+        )
+      ''')
+      c.execute('''
+        SELECT * FROM test_employment, test_company 
+        WHERE test_employment.user_id = 1
+        AND test_employment.company_id = test_company.company_id
+      ''')
+      c.execute('''
+        SELECT * FROM test_education, test_institution 
+        WHERE test_education.user_id = 1
+        AND test_education.institution_id = test_institution.institution_id
+      ''')
+
+    print(f"PostgreSQL query 2 complete! ({perf_counter()-t}s)")
+
+  def test_3(self):
+    """Test query 3 for PostgreSQL
+    """
+    t = perf_counter()
+    c = self.conn.cursor()
+
+    COUNT = 1000
+    print(f"Starting test 3 for PostgreSQL! ({COUNT}))")
+
+    print(f"  Running {COUNT} complex quer{'y' if COUNT == 1 else 'ies'}...")
+    for id in range(1,COUNT+1):
+      c.execute('''
+        (
+          SELECT cb.user_id_b 
+            FROM 
+              test_connection AS cb
+              INNER JOIN test_connection AS ca ON ca.user_id_b = cb.user_id_a
+            WHERE
+              ca.user_id_a = %(id)s
+          UNION
+          SELECT ca.user_id_a
+            FROM 
+              test_connection AS ca
+              INNER JOIN test_connection AS cb ON cb.user_id_a = ca.user_id_b
+            WHERE
+              cb.user_id_b = %(id)s
+          UNION
+          SELECT cb.user_id_a 
+            FROM 
+              test_connection AS cb
+              INNER JOIN test_connection AS ca ON ca.user_id_b = cb.user_id_b
+            WHERE
+              ca.user_id_a = %(id)s
+          UNION
+          SELECT ca.user_id_b
+            FROM 
+              test_connection AS ca
+              INNER JOIN test_connection AS cb ON cb.user_id_a = ca.user_id_a
+            WHERE
+              cb.user_id_b = %(id)s
+        )
+        EXCEPT
+        (
+          SELECT user_id_b FROM test_connection WHERE user_id_a = %(id)s
+          UNION
+          SELECT user_id_a FROM test_connection WHERE user_id_b = %(id)s
+        )
+      ''', {'id': id})
+
+    print(f"PostgreSQL query 3 complete! ({perf_counter()-t}s)")
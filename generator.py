@@ -1,4 +1,5 @@
 import faker, random, faker_education, time, os, pickle
+from profiler import phase
 
 # ---------------------------------------------------------------------------- #
 #                              Global Faker Object                             #
@@ -138,12 +139,18 @@ class Data:
     self.avg_education = avg_education
     self.pm_education = pm_education
 
-    self.__generate_users__()
-    self.__generate_companies__()
-    self.__generate_institutions__()
-    self.__generate_connections__()
-    self.__generate_employments__()
-    self.__generate_educations__()
+    with phase("generate.users"):
+      self.__generate_users__()
+    with phase("generate.companies"):
+      self.__generate_companies__()
+    with phase("generate.institutions"):
+      self.__generate_institutions__()
+    with phase("generate.connections"):
+      self.__generate_connections__()
+    with phase("generate.employments"):
+      self.__generate_employments__()
+    with phase("generate.educations"):
+      self.__generate_educations__()
 
   def __str__(self) -> str:
     res = ""
@@ -0,0 +1,200 @@
+import os, sys, time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+
+# The profilers themselves (cProfile, pstats, tracemalloc, threading) are only
+# imported once profiling is enabled, so unprofiled runs do not pay for them.
+
+# ---------------------------------------------------------------------------- #
+#                             Profiler Configuration                           #
+# ---------------------------------------------------------------------------- #
+
+# cprofile     deterministic profile per phase (.prof and .txt)
+# sample       sampled stacks of the main thread per phase (.folded)
+# tracemalloc  python allocation peak and largest live allocations per phase (.txt)
+# resource     wall time, cpu time and rss per phase run (resource.csv)
+MODES = ("cprofile", "sample", "tracemalloc", "resource")
+
+# The sampler runs in its own thread and the other modes slow down the code they
+# observe, so these modes have to be used on their own to give honest numbers.
+EXCLUSIVE_MODES = ("sample", "resource")
+
+SAMPLE_INTERVAL = 0.005
+TOP_ALLOCATIONS = 25
+
+class Profiler:
+  def __init__(self, modes, directory) -> None:
+    import threading
+
+    self.modes = set(modes)
+    self.directory = directory
+
+    self.profiles = {}
+    self.samples = defaultdict(Counter)
+    self.allocations = {}
+    self.rows = []
+
+    self.current = None
+    self.sampled = None
+    self.sampler = None
+    self.main_thread = threading.main_thread().ident
+
+  def __sample__(self):
+    while self.sampler is not None:
+      frame = sys._current_frames().get(self.main_thread)
+      phase = self.sampled
+      if frame is not None and phase is not None:
+        stack = []
+        while frame is not None:
+          code = frame.f_code
+          stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+          frame = frame.f_back
+        self.samples[phase][";".join(reversed(stack))] += 1
+      time.sleep(SAMPLE_INTERVAL)
+
+  @contextmanager
+  def phase(self, name):
+    if self.current is not None:
+      # phases do not nest, the outer phase already accounts for this one
+      yield
+      return
+    self.current = name
+
+    if "tracemalloc" in self.modes:
+      import tracemalloc
+      tracemalloc.start()
+    if "sample" in self.modes:
+      import threading
+      self.sampler = threading.Thread(target=self.__sample__, daemon=True)
+      self.sampler.start()
+    if "cprofile" in self.modes:
+      import cProfile
+      profile = self.profiles.setdefault(name, cProfile.Profile())
+      profile.enable()
+    if "resource" in self.modes:
+      reset = reset_peak_rss()
+      rss = current_rss()
+      cpu = time.process_time()
+      wall = time.perf_counter()
+
+    self.sampled = name
+    try:
+      yield
+    finally:
+      self.sampled = None
+      if "resource" in self.modes:
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        self.rows.append((name, wall, cpu, rss, current_rss(), peak_rss() if reset else None))
+      if "cprofile" in self.modes:
+        profile.disable()
+      if "sample" in self.modes:
+        sampler, self.sampler = self.sampler, None
+        sampler.join()
+      if "tracemalloc" in self.modes:
+        (_, peak) = tracemalloc.get_traced_memory()
+        if name not in self.allocations or peak > self.allocations[name][0]:
+          self.allocations[name] = (peak, tracemalloc.take_snapshot())
+        tracemalloc.stop()
+
+      self.current = None
+
+  def write(self):
+    os.makedirs(self.directory, exist_ok=True)
+
+    if self.profiles:
+      import io, pstats
+    for name, profile in self.profiles.items():
+      profile.dump_stats(os.path.join(self.directory, f"{name}.prof"))
+      out = io.StringIO()
+      pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(50)
+      with open(os.path.join(self.directory, f"{name}.cprofile.txt"), "w") as f:
+        f.write(out.getvalue())
+
+    for name, stacks in self.samples.items():
+      with open(os.path.join(self.directory, f"{name}.folded"), "w") as f:
+        for stack, count in stacks.most_common():
+          f.write(f"{stack} {count}\n")
+
+    if self.allocations:
+      import contextlib, tracemalloc
+    for name, (peak, snapshot) in self.allocations.items():
+      with open(os.path.join(self.directory, f"{name}.tracemalloc.txt"), "w") as f:
+        f.write(f"Peak traced memory: {peak/1024:.1f} KiB\n")
+        f.write(f"Top {TOP_ALLOCATIONS} allocations still alive at the end of the phase, by line:\n")
+        snapshot = snapshot.filter_traces((tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, contextlib.__file__)))
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+          f.write(f"  {stat}\n")
+
+    if self.rows:
+      with open(os.path.join(self.directory, "resource.csv"), "w") as f:
+        f.write("phase,wall_s,cpu_s,rss_start_kib,rss_end_kib,rss_peak_kib\n")
+        for row in self.rows:
+          f.write(",".join("" if x is None else str(x) for x in row) + "\n")
+
+    print(f"Profiling reports written to {self.directory}/")
+
+# ---------------------------------------------------------------------------- #
+#                               Helper Functions                               #
+# ---------------------------------------------------------------------------- #
+
+def read_status(field):
+  """Read a KiB field of /proc/self/status, or None where unavailable
+  """
+  try:
+    with open("/proc/self/status") as f:
+      for line in f:
+        if line.startswith(f"{field}:"):
+          return int(line.split()[1])
+  except (OSError, ValueError):
+    pass
+  return None
+
+def current_rss():
+  """Resident set size of this process in KiB, or None where unavailable
+  """
+  return read_status("VmRSS")
+
+def peak_rss():
+  """Peak resident set size since the last `reset_peak_rss` in KiB
+  """
+  return read_status("VmHWM")
+
+def reset_peak_rss():
+  """Reset the peak resident set size, returns whether it was allowed
+  """
+  try:
+    with open("/proc/self/clear_refs", "w") as f:
+      f.write("5")
+    return True
+  except OSError:
+    return False
+
+# ---------------------------------------------------------------------------- #
+#                                Global Profiler                               #
+# ---------------------------------------------------------------------------- #
+
+PROFILER = None
+
+def enable(modes, directory="profiles"):
+  """Enable profiling of every phase for the rest of this process
+  """
+  global PROFILER
+  modes = set(modes)
+  for mode in EXCLUSIVE_MODES:
+    if mode in modes and len(modes) > 1:
+      raise ValueError(f"The {mode} profiling mode can not be combined with other modes")
+  PROFILER = Profiler(modes, directory)
+
+def phase(name):
+  """Context manager wrapping a profiled phase, does nothing unless enabled
+  """
+  if PROFILER is None:
+    return nullcontext()
+  return PROFILER.phase(name)
+
+def write():
+  """Write the reports of every finished phase
+  """
+  if PROFILER is not None:
+    PROFILER.write()